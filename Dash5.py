@@ -1,19 +1,31 @@
 import os
-import chardet
+import json
 import pandas as pd
 import numpy as np
-from dash import Dash, dcc, html, Input, Output
+from dash import Dash, dcc, html, Input, Output, State
 import plotly.graph_objects as go
 import plotly.express as px
+import plotly.io as pio
 import dash_daq as daq
 import requests
 import io
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from pathlib import Path
+from functools import lru_cache
+import hashlib
+import threading
+from flask_caching import Cache
 
 # ===== 1) 基础配置 =====
 # 优先用远程 CSV（环境变量 CSV_URL 提供），否则读取本地 data/ 目录
 CSV_URL = os.getenv("CSV_URL", "").strip()
 CSV_PATH = Path(__file__).parent / "data" / "doc_risk_scores_k7.csv"
+# 图表 JSON 的磁盘缓存目录（环境变量 CACHE_DIR 可改；多个 Gunicorn worker 共享，重启后仍然有效）
+# 缓存用 pickle 读写，目录必须只有运行本应用的用户可写：默认放在应用目录下，新建时权限 0700
+CACHE_DIR = os.getenv("CACHE_DIR", "").strip() or str(Path(__file__).parent / ".dashcache")
+# WARM_CACHE=1 时导入后在后台预热磁盘缓存（建议只给一个进程开）；直接运行本文件时总会预热
+WARM_CACHE = os.getenv("WARM_CACHE", "").strip() == "1"
 
 RED = "#C25759"
 RED_LIGHT = "#E69191"
@@ -21,18 +33,85 @@ BLUE = "#599CB4"
 BLUE_LIGHT = "#92B5CA"
 
 # ===== 2) 读数工具 =====
+def sniff_enc(head: bytes) -> str:
+    # 先看 BOM，再试严格 UTF-8 解码；都不行才交给 charset_normalizer 猜
+    if head.startswith(b"\xef\xbb\xbf"):
+        return "utf-8-sig"
+    if head.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return "utf-16"
+    try:
+        head.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError as e:
+        # 截断处可能刚好切在多字节字符中间
+        if e.start >= len(head) - 3 and e.reason == "unexpected end of data":
+            return "utf-8"
+    import charset_normalizer
+    best = charset_normalizer.from_bytes(head).best()
+    return best.encoding if best else "utf-8"
+
+class _ChunkStream(io.RawIOBase):
+    # 把 requests 的分块迭代器包装成只读文件对象，不必先拼出完整的响应体
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._buf = memoryview(b"")
+
+    def readable(self):
+        return True
+
+    def peek(self, n):
+        # 攒够 n 字节（或读到结尾）后返回开头部分，不消费数据，用于判断编码
+        parts = [self._buf]
+        size = len(self._buf)
+        while size < n:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            parts.append(chunk)
+            size += len(chunk)
+        self._buf = memoryview(b"".join(parts))
+        return bytes(self._buf[:n])
+
+    def readinto(self, b):
+        # 尽量填满 b：pyarrow 把每次读到的内容当作一个解析块，
+        # 服务器的分块可能很短，直接返回会把一行拆到两个块里
+        n = 0
+        while n < len(b):
+            if not self._buf:
+                chunk = next(self._chunks, None)
+                if chunk is None:
+                    break
+                self._buf = memoryview(chunk)
+            k = min(len(b) - n, len(self._buf))
+            b[n:n + k] = self._buf[:k]
+            self._buf = self._buf[k:]
+            n += k
+        return n
+
+def _read_arrow(source, enc) -> pd.DataFrame:
+    # pyarrow 多线程解析；UTF-8（含 BOM）原生支持，其余编码由 pyarrow 转码
+    if enc in ("utf-8", "utf-8-sig"):
+        enc = "utf8"
+    tbl = pacsv.read_csv(
+        source,
+        read_options=pacsv.ReadOptions(encoding=enc, use_threads=True),
+        convert_options=pacsv.ConvertOptions(
+            column_types={f"RD_{i}": pa.float32() for i in range(7)}),
+    )
+    return tbl.to_pandas()
+
 def read_csv_smart(path_or_url) -> pd.DataFrame:
     # 如果是 URL，就在线读取
     if isinstance(path_or_url, str) and (path_or_url.startswith("http://") or path_or_url.startswith("https://")):
-        resp = requests.get(path_or_url, timeout=30)
-        resp.raise_for_status()
-        enc = chardet.detect(resp.content[:50000]).get("encoding") or "utf-8"
-        buf = io.BytesIO(resp.content)
-        return pd.read_csv(buf, encoding=enc, low_memory=False)
+        # 流式下载：先攒够 64 KB 判断编码，之后边下载边交给 pyarrow 解析
+        with requests.get(path_or_url, timeout=30, stream=True) as resp:
+            resp.raise_for_status()
+            body = _ChunkStream(resp.iter_content(chunk_size=65536))
+            return _read_arrow(body, sniff_enc(body.peek(65536)))
     # 否则当作本地文件
     with open(path_or_url, "rb") as f:
-        enc = chardet.detect(f.read(50_000)).get("encoding") or "utf-8"
-    return pd.read_csv(path_or_url, encoding=enc, low_memory=False)
+        enc = sniff_enc(f.read(65536))
+    return _read_arrow(str(path_or_url), enc)
 
 # ===== 3) 加载与整理数据 =====
 raw = read_csv_smart(CSV_URL if CSV_URL else CSV_PATH)
@@ -48,32 +127,95 @@ if "year" not in raw.columns:
 if "industry" not in raw.columns:
     raw["industry"] = "未指定"
 
-raw["市场风险"]   = raw["RD_0"]
-raw["信用风险"]   = raw["RD_1"]
-raw["操作风险"]   = raw["RD_2"] + raw["RD_5"]
-raw["法律合规风险"] = raw["RD_3"]
-raw["技术风险"]   = raw["RD_4"] + raw["RD_6"]
+CATS = ["市场风险", "信用风险", "操作风险", "法律合规风险", "技术风险"]
 
-wide = raw[["company", "year", "industry",
-            "市场风险", "信用风险", "操作风险", "法律合规风险", "技术风险"]].copy()
+# RD_0..RD_6 取成一块连续的 float32 矩阵，一次性算出五个类别与综合
+rd = np.ascontiguousarray(raw[[f"RD_{i}" for i in range(7)]].to_numpy(dtype=np.float32))
+WIDE_MAT = np.column_stack([
+    rd[:, 0],                        # 市场风险
+    rd[:, 1],                        # 信用风险
+    np.add(rd[:, 2], rd[:, 5]),      # 操作风险
+    rd[:, 3],                        # 法律合规风险
+    np.add(rd[:, 4], rd[:, 6]),      # 技术风险
+])
+zonghe = np.nanmean(WIDE_MAT, axis=1, dtype=np.float32)  # 与 pandas mean 一样跳过缺失值
+
+wide = pd.DataFrame({
+    "company": raw["company"].to_numpy(),
+    "year": raw["year"].to_numpy(),
+    "industry": raw["industry"].to_numpy(),
+    **{c: WIDE_MAT[:, i] for i, c in enumerate(CATS)},
+    "综合": zonghe,
+})
+# 字符串/年份列转成 category：过滤、isin、unique 都走整数编码
+for col in ("company", "industry", "year"):
+    wide[col] = wide[col].astype("category")
 
-CATS = ["市场风险", "信用风险", "操作风险", "法律合规风险", "技术风险"]
 YEARS = list(pd.unique(wide["year"]))
 YEARS.sort()
 
-wide["综合"] = wide[CATS].mean(axis=1)
+# 按年份预先分组：回调里直接查字典，不再每次全表过滤
+YEAR_IDX = wide.groupby("year", sort=False, observed=True).indices
+BY_YEAR = {y: wide.iloc[idx].reset_index(drop=True) for y, idx in YEAR_IDX.items()}
+# 热力图矩阵按 类别×公司 预先转置成连续的 float32 块，x 轴用公司名
+HEAT = {y: np.ascontiguousarray(WIDE_MAT[idx].T) for y, idx in YEAR_IDX.items()}
+HEAT_X = {y: dfy["company"].tolist() for y, dfy in BY_YEAR.items()}
+EMPTY = wide.iloc[0:0]
+# 雷达图：(年份, 公司) -> 五个类别得分，同名公司取第一行
+RADAR_ROW = {}
+for y, idx in YEAR_IDX.items():
+    for c, row in zip(HEAT_X[y], WIDE_MAT[idx]):
+        RADAR_ROW.setdefault((y, c), row)
+
+def top_n(values, n):
+    # argpartition 取前 n，只对这 n 个排序，不做全量排序；NaN 排在最后
+    n = min(n, len(values))
+    if n == 0:
+        return np.empty(0, dtype=np.intp)
+    part = np.argpartition(-values, n - 1)[:n]
+    return part[np.argsort(-values[part], kind="stable")]
 
 def top_companies(year, n=8):
-    dfy = wide[wide["year"] == year].sort_values("综合", ascending=False)
-    return dfy["company"].head(n).tolist()
+    # 直接用已算好的综合排名，与图上显示的综合同源
+    if year not in YEAR_IDX:
+        return []
+    names = HEAT_X[year]
+    return [names[i] for i in top_n(zonghe[YEAR_IDX[year]], n)]
+
+# 每个年份的下拉选项与默认值也只算一次
+YEAR_OPTS = {}
+for y, dfy in BY_YEAR.items():
+    top = top_companies(y)
+    YEAR_OPTS[y] = {
+        "company_opts": [{"label": c, "value": c} for c in dfy["company"].unique()],
+        "industry_opts": [{"label": i, "value": i} for i in dfy["industry"].unique()],
+        "default_company": top[0],
+        "default_compare": top,
+    }
 
 # ===== 4) Dash 应用 =====
-app = Dash(__name__, title="可视化风险仪表盘", suppress_callback_exceptions=True)
+# 回调输出经 plotly 的 JSON 编码器序列化：固定用 orjson，并开启 gzip 压缩
+pio.json.config.default_engine = "orjson"
+app = Dash(__name__, title="可视化风险仪表盘", suppress_callback_exceptions=True, compress=True)
 server = app.server  # 关键：给 Gunicorn 用
 
-theme_colors = {
-    'light': {'background': 'white', 'text': 'black'},
-    'dark': {'background': '#2E2E2E', 'text': 'white'}
+# 缓存键前缀带上数据和代码的指纹：换了 CSV 或改了作图代码，旧缓存自动失效
+CACHE_VERSION = hashlib.sha1(
+    pd.util.hash_pandas_object(wide).to_numpy().tobytes() + Path(__file__).read_bytes()
+).hexdigest()[:12]
+os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+cache = Cache(server, config={
+    "CACHE_TYPE": "FileSystemCache",
+    "CACHE_DIR": CACHE_DIR,
+    "CACHE_DEFAULT_TIMEOUT": 86400,
+    "CACHE_THRESHOLD": 20000,  # 默认 500 条，装不下所有 (年份, 公司, 主题) 组合
+    "CACHE_KEY_PREFIX": f"fig-{CACHE_VERSION}-",
+})
+
+# 主题配色：是否深色 -> (背景色, 文字色)
+THEME = {
+    False: ("white", "black"),
+    True: ("#2E2E2E", "white"),
 }
 
 app.layout = html.Div(
@@ -86,77 +228,115 @@ app.layout = html.Div(
             labelPosition='top',
             color="lightgray"
         ),
-        html.Div(id="main-content")
+        # 主内容只渲染一次，切换主题时由浏览器端改样式
+        html.Div(
+            id="main-content",
+            style={"backgroundColor": THEME[False][0], "color": THEME[False][1], "padding": "10px"},
+            children=[
+                html.H2("上市公司风险可视化仪表盘",
+                        style={"textAlign": "center", "margin": "12px 0"}),
+
+                html.Div(style={"display": "flex", "gap": "12px", "flexWrap": "wrap",
+                                "alignItems": "center", "justifyContent": "space-between", "marginBottom": "6px"},
+                         children=[
+                             html.Div(children=[
+                                 html.Div("选择年份"),
+                                 dcc.Dropdown(id="year",
+                                              options=[{"label": str(y), "value": y} for y in YEARS],
+                                              value=YEARS[-1],
+                                              clearable=False,
+                                              style={"minWidth": "160px"})
+                             ]),
+                             html.Div(children=[
+                                 html.Div("选择公司（雷达图）"),
+                                 dcc.Dropdown(id="company",
+                                              options=[], value=None, clearable=False,
+                                              style={"minWidth": "220px"})
+                             ]),
+                             html.Div(children=[
+                                 html.Div("选择行业"),
+                                 dcc.Dropdown(id="industry-filter",
+                                              options=[], value=None, clearable=True,
+                                              style={"minWidth": "220px"})
+                             ]),
+                             html.Div(children=[
+                                 html.Div("对比公司（可多选）"),
+                                 dcc.Dropdown(id="companies_compare",
+                                              options=[], value=[], multi=True,
+                                              style={"minWidth": "320px"})
+                             ]),
+                             html.Div(children=[
+                                 html.Div("对比维度"),
+                                 dcc.Dropdown(id="compare_metric",
+                                              options=[{"label": "综合（各类别均值）", "value": "综合"}] +
+                                                      [{"label": c, "value": c} for c in CATS],
+                                              value="综合", clearable=False,
+                                              style={"minWidth": "220px"})
+                             ]),
+                         ]),
+
+                html.Div(style={"display": "grid", "gridTemplateColumns": "1fr 1fr", "gap": "12px"},
+                         children=[
+                             dcc.Graph(id="radar", config={"displaylogo": False}),
+                             dcc.Graph(id="bars", config={"displaylogo": False}),
+                         ]),
+
+                html.Div(children=[
+                    html.H3("热力图"),
+                    dcc.Graph(id="heatmap")
+                ]),
+
+                # 当前年份的统一入口：三张图都从这里取年份
+                dcc.Store(id="year-slice", storage_type="memory"),
+            ]
+        )
     ]
 )
 
-# ===== 5) 主内容根据主题变化 =====
-@app.callback(
-    Output("main-content", "children"),
-    Input("theme-switch", "value")
+# ===== 5) 主题切换（浏览器端回调，不回服务器） =====
+THEME_JS = "var c = isDark ? %s : %s;" % (json.dumps(THEME[True]), json.dumps(THEME[False]))
+
+app.clientside_callback(
+    """
+    function(isDark) {
+        %s
+        return {"backgroundColor": c[0], "color": c[1], "padding": "10px"};
+    }
+    """ % THEME_JS,
+    Output("main-content", "style"),
+    Input("theme-switch", "value"),
+)
+
+# 已渲染的图只改背景色和文字色，不重新请求服务器
+app.clientside_callback(
+    """
+    function(isDark, radar, bars, heatmap) {
+        %s
+        return [radar, bars, heatmap].map(function(fig) {
+            if (!fig) {
+                return window.dash_clientside.no_update;
+            }
+            var layout = Object.assign({}, fig.layout);
+            layout.paper_bgcolor = c[0];
+            layout.font = Object.assign({}, layout.font, {color: c[1]});
+            if (layout.polar && layout.polar.radialaxis) {
+                var axis = Object.assign({}, layout.polar.radialaxis);
+                axis.tickfont = Object.assign({}, axis.tickfont, {color: c[1]});
+                layout.polar = Object.assign({}, layout.polar, {radialaxis: axis});
+            }
+            return Object.assign({}, fig, {layout: layout});
+        });
+    }
+    """ % THEME_JS,
+    Output("radar", "figure", allow_duplicate=True),
+    Output("bars", "figure", allow_duplicate=True),
+    Output("heatmap", "figure", allow_duplicate=True),
+    Input("theme-switch", "value"),
+    State("radar", "figure"),
+    State("bars", "figure"),
+    State("heatmap", "figure"),
+    prevent_initial_call=True,
 )
-def toggle_theme(is_dark):
-    theme = theme_colors['dark'] if is_dark else theme_colors['light']
-    text_color = theme['text']
-    bg_color = theme['background']
-
-    return html.Div(
-        style={"backgroundColor": bg_color, "color": text_color, "padding": "10px"},
-        children=[
-            html.H2("上市公司风险可视化仪表盘",
-                    style={"textAlign": "center", "margin": "12px 0", "color": text_color}),
-
-            html.Div(style={"display": "flex", "gap": "12px", "flexWrap": "wrap",
-                            "alignItems": "center", "justifyContent": "space-between", "marginBottom": "6px"},
-                     children=[
-                         html.Div(children=[
-                             html.Div("选择年份"),
-                             dcc.Dropdown(id="year",
-                                          options=[{"label": str(y), "value": y} for y in YEARS],
-                                          value=YEARS[-1],
-                                          clearable=False,
-                                          style={"minWidth": "160px"})
-                         ]),
-                         html.Div(children=[
-                             html.Div("选择公司（雷达图）"),
-                             dcc.Dropdown(id="company",
-                                          options=[], value=None, clearable=False,
-                                          style={"minWidth": "220px"})
-                         ]),
-                         html.Div(children=[
-                             html.Div("选择行业"),
-                             dcc.Dropdown(id="industry-filter",
-                                          options=[], value=None, clearable=True,
-                                          style={"minWidth": "220px"})
-                         ]),
-                         html.Div(children=[
-                             html.Div("对比公司（可多选）"),
-                             dcc.Dropdown(id="companies_compare",
-                                          options=[], value=[], multi=True,
-                                          style={"minWidth": "320px"})
-                         ]),
-                         html.Div(children=[
-                             html.Div("对比维度"),
-                             dcc.Dropdown(id="compare_metric",
-                                          options=[{"label": "综合（各类别均值）", "value": "综合"}] +
-                                                  [{"label": c, "value": c} for c in CATS],
-                                          value="综合", clearable=False,
-                                          style={"minWidth": "220px"})
-                         ]),
-                     ]),
-
-            html.Div(style={"display": "grid", "gridTemplateColumns": "1fr 1fr", "gap": "12px"},
-                     children=[
-                         dcc.Graph(id="radar", config={"displaylogo": False}),
-                         dcc.Graph(id="bars", config={"displaylogo": False}),
-                     ]),
-
-            html.Div(children=[
-                html.H3("热力图"),
-                dcc.Graph(id="heatmap")
-            ])
-        ]
-    )
 
 # ===== 6) 下拉选项联动 =====
 @app.callback(
@@ -169,34 +349,37 @@ def toggle_theme(is_dark):
     Input("year", "value"),
 )
 def _options_by_year(year):
-    dfy = wide[wide["year"] == year].copy()
-    opts = [{"label": company, "value": company} for company in dfy["company"].unique()]
-    if dfy.empty:
+    yo = YEAR_OPTS.get(year)
+    if yo is None:
         return [], None, [], None, [], []
-    default_company = dfy.sort_values("综合", ascending=False)["company"].iloc[0]
-    default_compare = top_companies(year, n=min(8, len(dfy)))
-    industry_opts = [{"label": industry, "value": industry} for industry in dfy["industry"].unique()]
-    return opts, default_company, industry_opts, None, opts, default_compare
+    opts = yo["company_opts"]
+    return opts, yo["default_company"], yo["industry_opts"], None, opts, yo["default_compare"]
 
-# ===== 7) 雷达图 =====
-@app.callback(
-    Output("radar", "figure"),
+# 只存年份键：各年份数据已在服务端缓存，不必把切片来回传给浏览器；
+# 在浏览器端完成，年份切换不多一次服务器往返（未知年份由各图回调返回空图）
+app.clientside_callback(
+    """
+    function(year) {
+        return (year === null || year === undefined) ? null : year;
+    }
+    """,
+    Output("year-slice", "data"),
     Input("year", "value"),
-    Input("company", "value"),
-    Input("theme-switch", "value"),
 )
-def _radar(year, company, is_dark):
-    theme = theme_colors['dark'] if is_dark else theme_colors['light']
-    text_color = theme['text']
-    bg_color = theme['background']
 
-    dfy = wide[(wide["year"] == year) & (wide["company"] == company)]
-    if dfy.empty:
-        r = [0] * len(CATS)
-    else:
-        r = dfy.iloc[0][CATS].tolist()
+# ===== 7) 雷达图 =====
+# 图表只取决于少量输入，缓存序列化后的 JSON，重复交互直接命中
+# 键空间在启动时就确定了：每个 (年份, 公司) × 两种主题，缓存大小按数据定
+@lru_cache(maxsize=len(RADAR_ROW) * 2)
+@cache.memoize()
+def _radar_json(year, company, is_dark):
+    bg_color, text_color = THEME[is_dark]
+
+    r = RADAR_ROW.get((year, company))
+    if r is None:
+        r = np.zeros(len(CATS), dtype=np.float32)
     theta = CATS + [CATS[0]]
-    rv = r + [r[0]]
+    rv = np.concatenate([r, r[:1]])
 
     fig = go.Figure()
     fig.add_trace(go.Scatterpolar(
@@ -212,35 +395,43 @@ def _radar(year, company, is_dark):
         font=dict(color=text_color),
         showlegend=False
     )
-    return fig
+    return fig.to_plotly_json()
 
-# ===== 8) 多公司对比条形图 =====
 @app.callback(
-    Output("bars", "figure"),
-    Input("year", "value"),
-    Input("companies_compare", "value"),
-    Input("compare_metric", "value"),
-    Input("theme-switch", "value"),
+    Output("radar", "figure"),
+    Input("year-slice", "data"),
+    Input("company", "value"),
+    State("theme-switch", "value"),
 )
-def _bars(year, companies, metric, is_dark):
-    theme = theme_colors['dark'] if is_dark else theme_colors['light']
-    text_color = theme['text']
-    bg_color = theme['background']
+def _radar(year, company, is_dark):
+    return _radar_json(year, company, bool(is_dark))
 
-    dfy = wide[wide["year"] == year].copy()
+# ===== 8) 多公司对比条形图 =====
+@lru_cache(maxsize=512)
+@cache.memoize()
+def _bars_json(year, companies, metric, is_dark):
+    bg_color, text_color = THEME[is_dark]
+
+    dfy = BY_YEAR.get(year, EMPTY)
     dfy = dfy[dfy["company"].isin(companies)]
     if dfy.empty:
-        return go.Figure()
-
-    dfy = dfy.sort_values(metric, ascending=True)
-    fig = px.bar(
-        dfy, x=metric, y="company", orientation="h",
-        color=np.where(dfy[metric] >= 0, "正", "负"),
-        color_discrete_map={"正": RED, "负": BLUE},
-        text=dfy[metric].round(2)
-    )
-    fig.update_traces(textposition="outside")
+        return go.Figure().to_plotly_json()
+
+    # 直接用 NumPy 排序、按正负拆成两条 go.Bar，不经过 px 的长表转换
+    vals = dfy[metric].to_numpy(dtype=np.float64)
+    order = np.argsort(vals, kind="stable")
+    vals = vals[order]
+    names = dfy["company"].to_numpy()[order]
+    pos = vals >= 0
+    fig = go.Figure([
+        go.Bar(x=vals[mask], y=names[mask], orientation="h",
+               name=label, showlegend=True, marker_color=color,
+               text=np.round(vals[mask], 2), textposition="outside")
+        for mask, label, color in ((~pos, "负", BLUE), (pos, "正", RED))
+        if mask.any()
+    ])
     fig.update_layout(
+        barmode="relative",
         title=f"公司对比（{year}，维度：{metric}）",
         xaxis_title="风险得分",
         yaxis_title="公司",
@@ -249,23 +440,27 @@ def _bars(year, companies, metric, is_dark):
         font=dict(color=text_color),
         legend_title_text=None
     )
-    return fig
+    return fig.to_plotly_json()
 
-# ===== 9) 热力图 =====
 @app.callback(
-    Output("heatmap", "figure"),
-    Input("year", "value"),
-    Input("theme-switch", "value"),
+    Output("bars", "figure"),
+    Input("year-slice", "data"),
+    Input("companies_compare", "value"),
+    Input("compare_metric", "value"),
+    State("theme-switch", "value"),
 )
-def _heatmap(year, is_dark):
-    theme = theme_colors['dark'] if is_dark else theme_colors['light']
-    text_color = theme['text']
-    bg_color = theme['background']
+def _bars(year, companies, metric, is_dark):
+    return _bars_json(year, tuple(companies or ()), metric, bool(is_dark))
 
-    dfy = wide[wide["year"] == year].copy()
-    if dfy.empty:
-        return go.Figure()
-    fig = px.imshow(dfy[CATS].T, color_continuous_scale="RdBu_r",
+# ===== 9) 热力图 =====
+@lru_cache(maxsize=len(YEAR_IDX) * 2)
+@cache.memoize()
+def _heatmap_json(year, is_dark):
+    bg_color, text_color = THEME[is_dark]
+
+    if year not in HEAT:
+        return go.Figure().to_plotly_json()
+    fig = px.imshow(HEAT[year], x=HEAT_X[year], y=CATS, color_continuous_scale="RdBu_r",
                     labels=dict(x="公司", y="风险类别", color="得分"))
     fig.update_layout(
         title=f"{year} 风险维度热力图",
@@ -273,9 +468,38 @@ def _heatmap(year, is_dark):
         paper_bgcolor=bg_color,
         font=dict(color=text_color)
     )
-    return fig
+    return fig.to_plotly_json()
+
+@app.callback(
+    Output("heatmap", "figure"),
+    Input("year-slice", "data"),
+    State("theme-switch", "value"),
+)
+def _heatmap(year, is_dark):
+    return _heatmap_json(year, bool(is_dark))
+
+# ===== 10) 预热磁盘缓存 =====
+def _warm_cache():
+    # 直接调用 memoize 层（__wrapped__），只写磁盘缓存，不占满进程内的 LRU
+    metrics = ["综合"] + CATS
+    try:
+        for y in YEARS:
+            # 年份要和浏览器回传的值一致（JSON 里是普通 int/str），否则缓存键对不上
+            y = y.item() if isinstance(y, np.generic) else y
+            for is_dark in (False, True):
+                _heatmap_json.__wrapped__(y, is_dark)
+                top = tuple(YEAR_OPTS[y]["default_compare"])
+                for metric in metrics:
+                    _bars_json.__wrapped__(y, top, metric, is_dark)
+                for c in HEAT_X[y]:
+                    _radar_json.__wrapped__(y, c, is_dark)
+    except Exception:
+        server.logger.exception("预热图表缓存失败")
+
+if WARM_CACHE or __name__ == "__main__":
+    threading.Thread(target=_warm_cache, daemon=True).start()
 
-# ===== 10) 启动入口 =====
+# ===== 11) 启动入口 =====
 if __name__ == "__main__":
     app.run_server(
         host="0.0.0.0",